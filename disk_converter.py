@@ -3,10 +3,11 @@
 DiskForge — Conversor Universal de Discos Virtuais
 Compatível com Windows | Python 3.8+
 qemu-img.exe embutido em tools/qemu/.
+
+Motor de conversão e linha de comando; a interface gráfica (tkinter) fica
+em disk_converter_gui.py e só é importada quando a janela é aberta.
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
 import threading
 import subprocess
 import os
@@ -15,8 +16,13 @@ import queue
 import time
 import re
 import shutil
+import struct
+import json
+import socket
+import argparse
+import hashlib
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 # ─── Constantes ─────────────────────────────────────────────────────
 
@@ -47,37 +53,18 @@ FORMATS = {
                   "desc": "Parallels Desktop para Mac"},
 }
 
-# ─── Paleta ─────────────────────────────────────────────────────────
-
-C = {
-    "bg":       "#0d0f18",
-    "surface":  "#13162a",
-    "surface2": "#1c2035",
-    "border":   "#252a45",
-    "accent":   "#4d7cfe",
-    "success":  "#27c87a",
-    "warning":  "#f5a623",
-    "error":    "#f0445a",
-    "text":     "#dde3f5",
-    "text2":    "#8892b0",
-    "text3":    "#4a5278",
-    "gold":     "#f5c842",
-}
-
-FF_MONO  = ("Courier New", 9)
-FF_SMALL = ("Segoe UI",    8)
-FF_LABEL = ("Segoe UI",    9)
-FF_TITLE = ("Segoe UI",   15, "bold")
+LOG_ICONS = {"info":"ℹ","ok":"✓","error":"✗","warn":"⚠","log":"·"}
 
 # ─── Utilitários ────────────────────────────────────────────────────
 
+def human_bytes(b: float) -> str:
+    for u in ("B","KB","MB","GB","TB"):
+        if b < 1024: return f"{b:.1f} {u}"
+        b /= 1024
+    return f"{b:.1f} PB"
+
 def human_size(path) -> str:
-    try:
-        b = os.path.getsize(str(path))
-        for u in ("B","KB","MB","GB","TB"):
-            if b < 1024: return f"{b:.1f} {u}"
-            b /= 1024
-        return f"{b:.1f} PB"
+    try: return human_bytes(os.path.getsize(str(path)))
     except: return "—"
 
 def human_time(seconds: float) -> str:
@@ -97,8 +84,229 @@ def qemu_path() -> str:
         return "qemu-img"
     return None
 
+# ─── VHD fixo nativo ─────────────────────────────────────────────────
+# Um VHD fixo é a imagem RAW seguida de um rodapé de 512 bytes. RAW ↔ VHD
+# fixo não precisa passar pelo qemu-img: basta clonar/copiar o conteúdo e
+# escrever ou remover o rodapé.
+
+VHD_FOOTER_SIZE = 512
+VHD_FIXED       = 2
+VHD_EPOCH       = 946684800          # 2000-01-01 00:00:00 UTC
+VHD_FOOTER_FMT  = ">8sIIQI4sI4sQQHBBII16sB427x"
+VHD_MAX_SIZE    = 2040 << 30         # limite do formato aceito por Hyper-V e qemu
+FICLONE         = 0x40049409         # ioctl de reflink (Linux: Btrfs, XFS)
+
+def vhd_geometry(size: int) -> tuple:
+    """CHS do rodapé VHD conforme o algoritmo da especificação da Microsoft."""
+    total = min(size // 512, 65535 * 16 * 255)
+    if total >= 65535 * 16 * 63:
+        spt, heads = 255, 16
+        cth = total // spt
+    else:
+        spt = 17
+        cth = total // spt
+        heads = max(4, (cth + 1023) // 1024)
+        if cth >= heads * 1024 or heads > 16:
+            spt, heads = 31, 16
+            cth = total // spt
+        if cth >= heads * 1024:
+            spt, heads = 63, 16
+            cth = total // spt
+    return cth // heads, heads, spt
+
+def vhd_checksum(footer: bytes) -> int:
+    return ~sum(footer) & 0xFFFFFFFF
+
+def vhd_footer(size: int) -> bytes:
+    cyl, heads, spt = vhd_geometry(size)
+    fields = [b"conectix", 2, 0x00010000, 0xFFFFFFFFFFFFFFFF,
+              max(0, int(time.time()) - VHD_EPOCH),
+              # Criador "win ": qemu e Hyper-V passam a usar current_size em
+              # vez da geometria CHS, que arredonda o tamanho para baixo.
+              b"win ", 0x000A0000, b"Wi2k", size, size,
+              cyl, heads, spt, VHD_FIXED, 0, os.urandom(16), 0]
+    blank = struct.pack(VHD_FOOTER_FMT, *fields)
+    fields[14] = vhd_checksum(blank)
+    return struct.pack(VHD_FOOTER_FMT, *fields)
+
+def vhd_read_footer(path):
+    """Retorna o rodapé de um VHD fixo válido como dict, ou None."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < VHD_FOOTER_SIZE:
+                return None
+            f.seek(-VHD_FOOTER_SIZE, os.SEEK_END)
+            raw = f.read(VHD_FOOTER_SIZE)
+            payload = f.tell() - VHD_FOOTER_SIZE
+    except OSError:
+        return None
+    v = struct.unpack(VHD_FOOTER_FMT, raw)
+    if v[0] != b"conectix" or v[13] != VHD_FIXED:
+        return None
+    blank = raw[:64] + b"\0\0\0\0" + raw[68:]
+    if vhd_checksum(blank) != v[14]:
+        return None
+    if v[9] != payload:
+        return None
+    return {"size": v[9], "creator": v[5], "geometry": (v[10], v[11], v[12])}
+
+def _clone_file(src, dst, prog_cb, prealloc=False) -> tuple:
+    """Copia src inteiro para dst pelo caminho mais barato disponível.
+
+    Tenta reflink (FICLONE), depois copy_file_range e, por fim, cópia em
+    blocos, pré-alocando dst antes dela se `prealloc`. Retorna
+    (método usado, pré-alocou).
+    """
+    size = os.path.getsize(src)
+    with open(src, "rb") as fi, open(dst, "wb") as fo:
+        try:
+            import fcntl
+            fcntl.ioctl(fo.fileno(), FICLONE, fi.fileno())
+            return "reflink", False
+        except (ImportError, OSError):
+            pass
+
+        done, method = 0, "cópia"
+        if hasattr(os, "copy_file_range"):
+            try:
+                while done < size:
+                    n = os.copy_file_range(fi.fileno(), fo.fileno(),
+                                           min(size - done, 1 << 30))
+                    if n == 0:
+                        break
+                    done += n
+                    prog_cb(2 + 96 * done / size)
+                method = "copy_file_range"
+            except OSError:
+                fi.seek(0); fo.seek(0); fo.truncate(); done = 0
+
+        reserved = prealloc and done == 0 and preallocate(fo.fileno(), size)
+        buf = bytearray(8 << 20)
+        view = memoryview(buf)
+        while done < size:
+            n = fi.readinto(buf)
+            if not n:
+                break
+            fo.write(view[:n])
+            done += n
+            prog_cb(2 + 96 * done / size)
+        return method, reserved
+
+def conv_vhd_native(src, dst, fmt_in, fmt_out, log_q, prog_cb,
+                    prealloc=False, stats=None):
+    """Converte RAW ↔ VHD fixo sem qemu-img.
+
+    Retorna None quando o par não é atendido nativamente (formatos
+    diferentes, VHD dinâmico, RAW não alinhado a 512 bytes ou acima de
+    2040 GiB) para que o chamador recorra ao qemu-img; caso contrário,
+    True/False. Em `stats`, registra "preallocated" e "written" (bytes
+    realmente gravados: um reflink não grava o conteúdo).
+    """
+    if (fmt_in, fmt_out) == ("raw", "vpc"):
+        size = os.path.getsize(src)
+        if size % 512:
+            log_q.put(("warn", "RAW não alinhado a 512 bytes — usando qemu-img."))
+            return None
+        if size > VHD_MAX_SIZE:
+            log_q.put(("warn", "RAW maior que 2040 GiB, o limite do VHD — usando qemu-img."))
+            return None
+        payload = size
+    elif (fmt_in, fmt_out) == ("vpc", "raw"):
+        footer = vhd_read_footer(src)
+        if footer is None:
+            return None
+        payload = footer["size"]
+    else:
+        return None
+
+    log_q.put(("info", "Motor nativo: RAW ↔ VHD fixo (sem reescrever os dados)"))
+    try:
+        method, reserved = _clone_file(src, dst, prog_cb, prealloc)
+        if fmt_out == "vpc":
+            with open(dst, "r+b") as f:
+                f.seek(payload)
+                f.write(vhd_footer(payload))
+                f.truncate()
+                os.fsync(f.fileno())
+        else:
+            os.truncate(dst, payload)
+    except OSError as e:
+        log_q.put(("error", f"Motor nativo falhou: {e}"))
+        return False
+
+    if stats is not None:
+        stats["preallocated"] = reserved
+        stats["written"] = (0 if method == "reflink" else payload) + \
+                           (VHD_FOOTER_SIZE if fmt_out == "vpc" else 0)
+    log_q.put(("ok", f"Conteúdo reaproveitado via {method}"))
+    return True
+
+# ─── Escrita atômica ─────────────────────────────────────────────────
+# A saída é gerada em um arquivo temporário no mesmo diretório do destino
+# e só é renomeada para o nome final depois de concluída e sincronizada,
+# então uma falha nunca deixa uma imagem parcial com cara de válida.
+
+# Só RAW é pré-alocado: em QCOW2, falloc reservaria o tamanho virtual
+# inteiro e a saída perderia o thin provisioning.
+PREALLOC_FORMATS = ("raw",)
+
+def allocated_size(path) -> int:
+    """Bytes efetivamente alocados no disco (st_blocks quando existe)."""
+    st = os.stat(path)
+    blocks = getattr(st, "st_blocks", None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+def preallocate(fd, size: int) -> bool:
+    """Reserva `size` bytes para o arquivo de uma vez, evitando fragmentação."""
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return True
+        except OSError:
+            return False
+    if sys.platform == "win32":
+        # No NTFS, estender um arquivo não esparso já aloca os clusters.
+        try:
+            os.ftruncate(fd, size)
+            return True
+        except OSError:
+            return False
+    return False
+
+def stage_path(dst) -> str:
+    dst = os.path.abspath(dst)
+    return os.path.join(os.path.dirname(dst),
+                        f".{os.path.basename(dst)}.{os.getpid()}.part")
+
+def stage_create(dst) -> str:
+    """Cria o temporário vazio de dst e retorna seu caminho."""
+    tmp = stage_path(dst)
+    os.close(os.open(tmp, os.O_CREAT | os.O_TRUNC | os.O_WRONLY
+                          | getattr(os, "O_BINARY", 0), 0o666))
+    return tmp
+
+def stage_commit(tmp, dst):
+    with open(tmp, "r+b") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, dst)
+    if sys.platform != "win32":
+        fd = os.open(os.path.dirname(os.path.abspath(dst)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def stage_discard(tmp):
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+
 # ─── Conversor universal ─────────────────────────────────────────────
 
+CONV_STEPS = ["Validar origem", "Converter", "Verificar saída"]
+
 def run_qemu(args: list, log_q: queue.Queue, prog_cb, eta_cb) -> int:
     exe = qemu_path()
     if not exe:
@@ -147,597 +355,521 @@ def run_qemu(args: list, log_q: queue.Queue, prog_cb, eta_cb) -> int:
         return -1
 
 
-def conv_universal(src, dst, fmt_in, fmt_out, log_q, prog_cb, step_cb, eta_cb):
+def qemu_json(args: list):
+    """Executa um subcomando do qemu-img com --output=json; None se falhar."""
+    exe = qemu_path()
+    if not exe:
+        return None
+    try:
+        out = subprocess.run(
+            [exe, args[0], "--output=json"] + args[1:],
+            capture_output=True, text=True, timeout=120,
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+        )
+        return json.loads(out.stdout) if out.returncode == 0 else None
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+def raw_extent(path, fmt) -> int:
+    """Tamanho do conteúdo RAW legível direto do arquivo; None se não houver."""
+    if fmt == "raw":
+        return os.path.getsize(path)
+    if fmt == "vpc":
+        footer = vhd_read_footer(path)
+        if footer:
+            return footer["size"]
+    return None
+
+def disk_virtual_size(path, fmt) -> int:
+    size = raw_extent(path, fmt)
+    if size is not None:
+        return size
+    return (qemu_json(["info", "-f", fmt, str(path)]) or {}).get("virtual-size", 0)
+
+
+def conv_universal(src, dst, fmt_in, fmt_out, log_q, prog_cb, step_cb, eta_cb,
+                   events=None, prealloc=True):
+    events = events or EventStream(None)
+    stats  = {"engine": "qemu-img", "bytes_total": 0}
+    log_q, prog_cb, step_cb = _attach_events(events, stats, CONV_STEPS,
+                                             log_q, prog_cb, step_cb)
+    events.emit("job_started", src=str(src), dst=str(dst),
+                fmt_in=fmt_in, fmt_out=fmt_out)
+    ok = False
+    try:
+        ok = _convert(src, dst, fmt_in, fmt_out, log_q, prog_cb, step_cb, eta_cb,
+                      events, stats, prealloc)
+        return ok
+    finally:
+        _emit_finished(events, ok, stats)
+
+
+def _emit_finished(events, ok, stats, **extra):
+    """job_finished com o mesmo conjunto de campos em todos os modos."""
+    copy_t  = events.copy_elapsed()
+    written = stats.get("written", 0) if ok else 0
+    events.emit("job_finished", ok=ok, engine=stats.get("engine", "qemu-img"),
+                elapsed=round(time.time() - events.started, 3),
+                bytes=stats["bytes_total"], written=written,
+                rate=int(written / copy_t) if copy_t > 0 else 0,
+                dst_bytes=stats.get("dst_bytes", 0) if ok else 0,
+                preallocated=stats.get("preallocated", False), **extra)
+
+
+def _attach_events(events, stats, steps, log_q, prog_cb, step_cb):
+    """Encaminha log, progresso e etapas também para o fluxo de eventos."""
+    if not events.enabled:
+        return log_q, prog_cb, step_cb
+    def prog(pct):
+        prog_cb(pct); events.progress(pct, stats["bytes_total"])
+    def step(idx):
+        step_cb(idx); events.emit("step", index=idx, name=steps[idx])
+    return _EventLog(log_q, events), prog, step
+
+
+def _convert(src, dst, fmt_in, fmt_out, log_q, prog_cb, step_cb, eta_cb,
+             events, stats, prealloc=True):
     step_cb(0)
     if not os.path.exists(src):
         log_q.put(("error", "Arquivo de origem não encontrado.")); return False
     log_q.put(("ok", f"Origem: {src}  ({human_size(src)})"))
     log_q.put(("info", f"Conversão: {fmt_in.upper()} → {fmt_out.upper()}"))
+
+    stats["bytes_total"] = disk_virtual_size(src, fmt_in)
+    # O próprio qemu-img reserva o espaço (falloc) ao criar a saída RAW; o
+    # motor nativo VHD pré-aloca por conta própria quando precisa copiar.
+    direct = (fmt_in, fmt_out) == ("vpc", "raw") and vhd_read_footer(src) is not None
+    stats["preallocated"] = prealloc and fmt_out in PREALLOC_FORMATS and not direct
+    measure = {}
+    if fmt_out in ("raw", "qcow2") and not direct:
+        measure = qemu_json(["measure", "-f", fmt_in, "-O", fmt_out, str(src)]) or {}
+    required = measure.get("fully-allocated" if stats["preallocated"] else "required", 0)
+    try:
+        free = shutil.disk_usage(os.path.dirname(os.path.abspath(dst))).free
+        if required > free:
+            log_q.put(("warn", f"Espaço livre ({human_bytes(free)}) menor que o "
+                               f"necessário ({human_bytes(required)})."))
+    except OSError:
+        pass
+    events.emit("preflight", src_bytes=os.path.getsize(src),
+                virtual_size=stats["bytes_total"], required=required)
     prog_cb(2)
 
     step_cb(1)
-    rc = run_qemu(["convert", "-p", "-f", fmt_in, "-O", fmt_out, src, dst],
-                  log_q, prog_cb, eta_cb)
-    if rc != 0:
-        log_q.put(("error", f"Conversão falhou (código {rc})")); return False
-
-    step_cb(2)
+    events.start_copy(2)
+    tmp, ok = None, False
+    try:
+        tmp = stage_create(dst)
+        t0 = time.time()
+        native = conv_vhd_native(src, tmp, fmt_in, fmt_out, log_q, prog_cb,
+                                 prealloc, stats)
+        if native is None:
+            opts = ["-o", "preallocation=falloc"] if stats["preallocated"] else []
+            rc = run_qemu(["convert", "-p", "-f", fmt_in, "-O", fmt_out] + opts +
+                          [src, tmp], log_q, prog_cb, eta_cb)
+            if rc != 0:
+                log_q.put(("error", f"Conversão falhou (código {rc})")); return False
+        elif not native:
+            return False
+        else:
+            stats["engine"] = "native"
+        dt = time.time() - t0
+
+        step_cb(2)
+        stage_commit(tmp, dst)
+        ok = True
+    except OSError as e:
+        log_q.put(("error", f"Falha ao gravar o destino: {e}")); return False
+    finally:
+        if tmp and not ok:
+            stage_discard(tmp)
+
+    # Bytes gravados: os dados que o qemu-img mediu (sem as regiões zeradas
+    # e sem a reserva do falloc) ou, sem medição, o que ficou alocado.
+    if "written" not in stats:
+        stats["written"] = measure.get("required") or allocated_size(dst)
+    if dt > 0:
+        log_q.put(("info", f"Escrita: {human_bytes(stats['written'])} em "
+                           f"{dt:.1f}s — {human_bytes(stats['written'] / dt)}/s"
+                           + ("  (pré-alocado)" if stats["preallocated"] else "")))
+    stats["dst_bytes"] = os.path.getsize(dst)
     log_q.put(("ok", f"Arquivo gerado: {dst}  ({human_size(dst)})"))
     prog_cb(100)
     return True
 
 
-# ─── Widget: FormatPicker ────────────────────────────────────────────
-
-class FormatPicker(tk.Frame):
-    """Seletor de formato com dropdown customizado."""
-
-    def __init__(self, parent, label_text, initial="qcow2", on_change=None, **kw):
-        super().__init__(parent, bg=C["bg"], **kw)
-        self._value     = initial
-        self._on_change = on_change
-        self._popup     = None
-
-        tk.Label(self, text=label_text, font=("Segoe UI",7,"bold"),
-                 fg=C["text3"], bg=C["bg"]).pack(anchor="w", pady=(0,4))
-
-        self._card = tk.Frame(self, bg=C["surface2"],
-                              highlightthickness=1,
-                              highlightbackground=C["border"],
-                              cursor="hand2")
-        self._card.pack(fill="x")
-
-        inner = tk.Frame(self._card, bg=C["surface2"])
-        inner.pack(fill="x", padx=10, pady=9)
-
-        self._ext_lbl  = tk.Label(inner, text="", font=("Courier New",9,"bold"),
-                                   fg=C["accent"], bg=C["surface2"], width=7, anchor="w")
-        self._ext_lbl.pack(side="left")
-
-        self._name_lbl = tk.Label(inner, text="", font=("Segoe UI",10,"bold"),
-                                   fg=C["text"], bg=C["surface2"])
-        self._name_lbl.pack(side="left")
-
-        self._star_lbl = tk.Label(inner, text="", font=("Segoe UI",9),
-                                   fg=C["gold"], bg=C["surface2"])
-        self._star_lbl.pack(side="left", padx=(3,0))
-
-        self._desc_lbl = tk.Label(inner, text="", font=FF_SMALL,
-                                   fg=C["text3"], bg=C["surface2"])
-        self._desc_lbl.pack(side="left", padx=(8,0))
+# ─── Frota: base compartilhada + overlays ────────────────────────────
+# VMs clonadas de um mesmo template compartilham a maior parte dos blocos.
+# A imagem que mais compartilha blocos com as demais vira a base QCOW2,
+# convertida uma única vez; cada VM sai como overlay QCOW2 fino sobre ela
+# (qemu-img rebase em modo seguro grava só os clusters que diferem da base).
+
+FLEET_BLOCK = 1 << 20                # granularidade da análise, não da saída
+FLEET_FORMATS = ("raw", "vpc")       # lidos direto por blocos (VHD só fixo)
+FLEET_STEPS = ["Analisar blocos", "Converter base", "Gerar overlays", "Verificar saída"]
+
+def block_hashes(path, fmt, prog_cb=lambda _: None) -> list:
+    """Hash de cada bloco da imagem (None para blocos zerados), ou None."""
+    size = raw_extent(path, fmt)
+    if size is None:
+        return None
+    zero, hashes, done = bytes(FLEET_BLOCK), [], 0
+    with open(path, "rb") as f:
+        while done < size:
+            chunk = f.read(min(FLEET_BLOCK, size - done))
+            if not chunk:
+                break
+            done += len(chunk)
+            hashes.append(None if chunk == zero[:len(chunk)]
+                          else hashlib.blake2b(chunk, digest_size=16).digest())
+            if len(hashes) % 256 == 0:
+                prog_cb(100 * done / size)
+    return hashes
+
+def fleet_scores(hashes: list) -> list:
+    """Para cada imagem, quantos blocos não nulos ela divide com as outras."""
+    scores = [0] * len(hashes)
+    for k in range(max(map(len, hashes))):
+        col = [h[k] if k < len(h) else None for h in hashes]
+        counts = {}
+        for x in col:
+            if x:
+                counts[x] = counts.get(x, 0) + 1
+        if len(counts) == sum(counts.values()):
+            continue
+        for i, x in enumerate(col):
+            if x:
+                scores[i] += counts[x] - 1
+    return scores
+
+def _path_key(path) -> str:
+    return os.path.normcase(os.path.realpath(path))
+
+def fleet_names(sources, out_dir, base_i) -> tuple:
+    """Destinos (base, overlays) que não colidem entre si nem com as origens.
+
+    Nomes repetidos (x/disk.vmdk, y/disk.vmdk) ganham sufixo -2, -3...
+    até ficarem livres.
+    """
+    taken = {_path_key(s) for s in sources}
+    def pick(stem, suffix):
+        n, name = 1, f"{stem}{suffix}"
+        while _path_key(Path(out_dir) / name) in taken:
+            n += 1
+            name = f"{stem}-{n}{suffix}"
+        taken.add(_path_key(Path(out_dir) / name))
+        return str(Path(out_dir) / name)
+    base = pick(Path(sources[base_i]).stem, ".base.qcow2")
+    return base, [pick(Path(s).stem, ".qcow2") for s in sources]
+
+
+def fleet_overlay(src, fmt_in, dst, base_name, log_q, prog_cb, eta_cb,
+                  is_base=False):
+    """Gera dst como overlay QCOW2 fino de src sobre a base.
+
+    O overlay nasce vazio apontando para a própria origem; o rebase seguro
+    para a base compara as duas cluster a cluster e copia só o que difere.
+    Para a VM que virou base (is_base) ele aponta direto para a base.
+    Os caminhos da base são relativos: base e overlays ficam juntos. O
+    overlay não é pré-alocado: falloc reservaria o disco inteiro e os
+    clusters reservados esconderiam os dados da base.
+    """
+    backing = ["-b", base_name, "-F", "qcow2"] if is_base else \
+              ["-b", os.path.abspath(src), "-F", fmt_in]
+    try:
+        tmp = stage_create(dst)
+    except OSError as e:
+        log_q.put(("error", f"Falha ao gravar o destino: {e}")); return False
+    try:
+        rc = run_qemu(["create", "-f", "qcow2"] + backing + [tmp],
+                      log_q, prog_cb, eta_cb)
+        if rc == 0 and not is_base:
+            rc = run_qemu(["rebase", "-p", "-f", "qcow2", "-b", base_name,
+                           "-F", "qcow2", tmp], log_q, prog_cb, eta_cb)
+        if rc != 0:
+            log_q.put(("error", f"Falha ao gerar overlay (código {rc})")); return False
+        stage_commit(tmp, dst)
+        log_q.put(("ok", f"Overlay: {dst}  ({human_size(dst)})"))
+        return True
+    except OSError as e:
+        log_q.put(("error", f"Falha ao gravar o destino: {e}")); return False
+    finally:
+        stage_discard(tmp)
+
+
+def conv_fleet(sources, out_dir, fmt_in, log_q, prog_cb, step_cb, eta_cb,
+               events=None):
+    events = events or EventStream(None)
+    stats  = {"bytes_total": 0}
+    log_q, prog_cb, step_cb = _attach_events(events, stats, FLEET_STEPS,
+                                             log_q, prog_cb, step_cb)
+    events.emit("job_started", mode="fleet", sources=[str(s) for s in sources],
+                dst=str(out_dir), fmt_in=fmt_in, fmt_out="qcow2")
+    ok = False
+    try:
+        ok = _fleet(sources, out_dir, fmt_in, log_q, prog_cb, step_cb, eta_cb,
+                    events, stats)
+        return ok
+    finally:
+        _emit_finished(events, ok, stats,
+                       naive_bytes=stats.get("naive_bytes", 0),
+                       dedup_ratio=stats.get("dedup_ratio", 0),
+                       time_saved=stats.get("time_saved", 0))
+
+
+def _fleet(sources, out_dir, fmt_in, log_q, prog_cb, step_cb, eta_cb,
+           events, stats):
+    step_cb(0)
+    n = len(sources)
+    if n < 2:
+        log_q.put(("error", "O modo frota precisa de pelo menos duas imagens.")); return False
+    if fmt_in not in FLEET_FORMATS:
+        log_q.put(("error", f"O modo frota compara blocos lendo o conteúdo RAW e só "
+                            f"aceita RAW ou VHD fixo, não {fmt_in.upper()}.")); return False
+    missing = [s for s in sources if not os.path.exists(s)]
+    if missing:
+        log_q.put(("error", f"Arquivo de origem não encontrado: {missing[0]}")); return False
+    os.makedirs(out_dir, exist_ok=True)
+    t_start = time.time()
+
+    hashes = []
+    for i, src in enumerate(sources):
+        log_q.put(("info", f"Analisando {src}  ({human_size(src)})"))
+        h = block_hashes(src, fmt_in,
+                        lambda p, i=i: prog_cb(10 * (i + p / 100) / n))
+        if h is None:
+            log_q.put(("error", f"{src} não é um VHD fixo válido.")); return False
+        hashes.append(h)
+
+    scores = fleet_scores(hashes)
+    base_i = scores.index(max(scores))
+    used   = sum(1 for x in hashes[base_i] if x)
+    shared = scores[base_i] / (n - 1)
+    log_q.put(("ok", f"Base: {sources[base_i]} — em média {shared:.0f} de "
+                     f"{used} blocos em uso coincidem com cada VM"))
+
+    stats["bytes_total"] = sum(disk_virtual_size(s, fmt_in) for s in sources)
+    naive = [(qemu_json(["measure", "-f", fmt_in, "-O", "qcow2", str(s)]) or {})
+             .get("required", 0) for s in sources]
+    # Referência: tamanho de cada VM convertida sozinha para QCOW2 esparso,
+    # comparável ao tamanho dos arquivos da frota (também não pré-alocados).
+    stats["naive_bytes"] = sum(naive)
+    events.emit("preflight", images=n, base=str(sources[base_i]),
+                virtual_size=stats["bytes_total"], naive_bytes=stats["naive_bytes"])
+    prog_cb(10)
 
-        tk.Label(inner, text="▾", font=("Segoe UI",12),
-                 fg=C["text3"], bg=C["surface2"]).pack(side="right")
+    step_cb(1)
+    events.start_copy(10)
+    quiet    = EventStream(None)
+    base_src = sources[base_i]
+    base_dst, outputs = fleet_names(sources, out_dir, base_i)
+    if {_path_key(p) for p in [base_dst] + outputs} & {_path_key(s) for s in sources}:
+        log_q.put(("error", "Um destino coincide com uma imagem de origem.")); return False
+    t0 = time.time()
+    if not _convert(base_src, base_dst, fmt_in, "qcow2", log_q,
+                    lambda p: prog_cb(10 + 30 * p / 100), lambda _: None, eta_cb,
+                    quiet, {"engine": "qemu-img"}, prealloc=False):
+        return False
+    base_time = time.time() - t0
 
-        for w in self._card.winfo_children() + [self._card]:
-            pass
-        self._bind_all_children(self._card, self._toggle)
-
-        self._refresh()
-
-    def _bind_all_children(self, widget, fn):
-        widget.bind("<Button-1>", fn)
-        widget.bind("<Enter>", lambda _: self._card.config(
-            highlightbackground=C["accent"]))
-        widget.bind("<Leave>", lambda _: self._popup or self._card.config(
-            highlightbackground=C["border"]))
-        for child in widget.winfo_children():
-            self._bind_all_children(child, fn)
-
-    def _refresh(self):
-        fmt = FORMATS[self._value]
-        self._ext_lbl.config(text=fmt["ext"])
-        self._name_lbl.config(text=fmt["label"])
-        self._star_lbl.config(text="★" if fmt["star"] else "")
-        self._desc_lbl.config(text=fmt["desc"])
-
-    def get(self): return self._value
-    def set(self, v):
-        self._value = v; self._refresh()
-
-    def _toggle(self, _=None):
-        if self._popup and self._popup.winfo_exists():
-            self._popup.destroy(); self._popup = None; return
-        self._open_popup()
-
-    def _open_popup(self):
-        self.update_idletasks()
-        x = self._card.winfo_rootx()
-        y = self._card.winfo_rooty() + self._card.winfo_height() + 2
-        w = self._card.winfo_width()
-        row_h = 34
-
-        pop = tk.Toplevel(self)
-        pop.wm_overrideredirect(True)
-        pop.geometry(f"{w}x{len(FORMATS)*row_h+2}+{x}+{y}")
-        pop.configure(bg=C["border"])
-        pop.lift()
-        self._popup = pop
-
-        wrap = tk.Frame(pop, bg=C["surface2"])
-        wrap.pack(fill="both", expand=True, padx=1, pady=1)
-
-        for key, info in FORMATS.items():
-            self._make_opt(wrap, key, info, row_h, pop)
-
-        pop.bind("<FocusOut>", lambda _: self._close_popup())
-        pop.focus_set()
-
-    def _make_opt(self, parent, key, info, row_h, pop):
-        sel = key == self._value
-        bg0 = C["surface"] if sel else C["surface2"]
-
-        row = tk.Frame(parent, bg=bg0, cursor="hand2", height=row_h)
-        row.pack(fill="x"); row.pack_propagate(False)
-
-        inn = tk.Frame(row, bg=bg0)
-        inn.pack(fill="both", expand=True, padx=10)
-
-        e = tk.Label(inn, text=info["ext"], font=("Courier New",8,"bold"),
-                     fg=C["accent"], bg=bg0, width=7, anchor="w")
-        e.pack(side="left")
-        n = tk.Label(inn, text=info["label"], font=FF_LABEL,
-                     fg=C["text"] if sel else C["text2"], bg=bg0)
-        n.pack(side="left")
-        if info["star"]:
-            tk.Label(inn, text=" ★", font=("Segoe UI",8),
-                     fg=C["gold"], bg=bg0).pack(side="left")
-        d = tk.Label(inn, text=info["desc"], font=FF_SMALL,
-                     fg=C["text3"], bg=bg0)
-        d.pack(side="right")
-
-        all_w = [row, inn, e, n, d]
-
-        def pick(k=key, p=pop):
-            self._value = k; self._refresh()
-            p.destroy(); self._popup = None
-            self._card.config(highlightbackground=C["border"])
-            if self._on_change: self._on_change(k)
-
-        def hov_on(_, ws=all_w):
-            for w in ws: w.config(bg=C["border"])
-        def hov_off(_, ws=all_w, bg=bg0):
-            for w in ws: w.config(bg=bg)
-
-        for w in all_w:
-            w.bind("<Button-1>", lambda _, f=pick: f())
-            w.bind("<Enter>", hov_on)
-            w.bind("<Leave>", hov_off)
-
-    def _close_popup(self):
-        if self._popup and self._popup.winfo_exists():
-            self._popup.destroy()
-        self._popup = None
-
-
-# ─── Widget: ProgressBar ────────────────────────────────────────────
-
-class ProgressBar(tk.Canvas):
-    def __init__(self, parent, height=7, **kw):
-        super().__init__(parent, height=height, bg=C["border"],
-                         highlightthickness=0, **kw)
-        self._pct = 0; self._anim = 0; self._h = height
-        self.bind("<Configure>", lambda _: self._redraw())
-        self._bar  = self.create_rectangle(0,0,0,height, fill=C["accent"], outline="")
-        self._glow = self.create_oval(0,-4,0,height+4, fill=C["accent"],
-                                      outline="", stipple="gray50")
-        self._tick()
-
-    def _redraw(self):
-        w = self.winfo_width()
-        fw = int(w * self._pct / 100)
-        self.coords(self._bar, 0, 0, fw, self._h)
-        self.coords(self._glow, fw-24, -2, fw+4, self._h+2)
-
-    def set(self, pct):
-        self._pct = max(0.0, min(100.0, pct)); self._redraw()
-
-    def _tick(self):
-        self._anim = (self._anim+1) % 20
-        a = abs(self._anim-10)/10
-        c = self._lerp(C["accent"], "#ffffff", a*0.3)
-        self.itemconfig(self._glow, fill=c)
-        self.after(60, self._tick)
-
-    @staticmethod
-    def _lerp(c1, c2, t):
-        r1,g1,b1=int(c1[1:3],16),int(c1[3:5],16),int(c1[5:7],16)
-        r2,g2,b2=int(c2[1:3],16),int(c2[3:5],16),int(c2[5:7],16)
-        return f"#{int(r1+(r2-r1)*t):02x}{int(g1+(g2-g1)*t):02x}{int(b1+(b2-b1)*t):02x}"
-
-
-# ─── Widget: StepList ───────────────────────────────────────────────
-
-class StepList(tk.Frame):
-    def __init__(self, parent, steps, **kw):
-        super().__init__(parent, bg=C["bg"], **kw)
-        self._rows = []
-        for s in steps:
-            row = tk.Frame(self, bg=C["bg"]); row.pack(anchor="w", pady=2)
-            dot = tk.Label(row, text="○", font=("Segoe UI",10),
-                           fg=C["text3"], bg=C["bg"], width=2)
-            dot.pack(side="left")
-            lbl = tk.Label(row, text=s, font=FF_LABEL, fg=C["text3"], bg=C["bg"])
-            lbl.pack(side="left", padx=4)
-            self._rows.append((dot, lbl))
-
-    def activate(self, idx):
-        for i,(d,l) in enumerate(self._rows):
-            if i<idx:   d.config(text="●",fg=C["success"]); l.config(fg=C["text2"])
-            elif i==idx:d.config(text="◉",fg=C["accent"]);  l.config(fg=C["text"])
-            else:       d.config(text="○",fg=C["text3"]);   l.config(fg=C["text3"])
-
-    def complete(self):
-        for d,l in self._rows:
-            d.config(text="●",fg=C["success"]); l.config(fg=C["success"])
-
-    def reset(self):
-        for d,l in self._rows:
-            d.config(text="○",fg=C["text3"]); l.config(fg=C["text3"])
-
-
-# ─── Widget: FileRow ────────────────────────────────────────────────
-
-class FileRow(tk.Frame):
-    def __init__(self, parent, label, var, browse_cmd, **kw):
-        super().__init__(parent, bg=C["bg"], **kw)
-        tk.Label(self, text=label.upper(), font=("Segoe UI",7,"bold"),
-                 fg=C["text3"], bg=C["bg"]).pack(anchor="w", pady=(0,4))
-
-        box = tk.Frame(self, bg=C["surface2"],
-                       highlightthickness=1, highlightbackground=C["border"])
-        box.pack(fill="x")
-
-        self._entry = tk.Entry(box, textvariable=var, font=FF_LABEL,
-                               bg=C["surface2"], fg=C["text"], relief="flat",
-                               insertbackground=C["accent"], bd=7)
-        self._entry.pack(side="left", fill="x", expand=True)
-        self._entry.bind("<FocusIn>",
-            lambda _: box.config(highlightbackground=C["accent"]))
-        self._entry.bind("<FocusOut>",
-            lambda _: box.config(highlightbackground=C["border"]))
-
-        btn = tk.Label(box, text="  Procurar  ", font=FF_SMALL,
-                       fg=C["accent"], bg=C["surface2"], cursor="hand2")
-        btn.pack(side="right", padx=4)
-        btn.bind("<Button-1>", lambda _: browse_cmd())
-        btn.bind("<Enter>", lambda _: btn.config(fg=C["text"]))
-        btn.bind("<Leave>", lambda _: btn.config(fg=C["accent"]))
-
-        self._info = tk.Label(self, text="", font=FF_SMALL, fg=C["text3"], bg=C["bg"])
-        self._info.pack(anchor="w", pady=(3,0))
-
-    def set_info(self, text, color=None):
-        self._info.config(text=text, fg=color or C["text3"])
-
-
-# ─── App principal ───────────────────────────────────────────────────
+    step_cb(2)
+    base_name = os.path.basename(base_dst)
+    for i, (src, dst) in enumerate(zip(sources, outputs)):
+        lo = 40 + 60 * i / n
+        if not fleet_overlay(src, fmt_in, dst, base_name, log_q,
+                             lambda p, lo=lo: prog_cb(lo + 60 * p / 100 / n),
+                             eta_cb, is_base=(i == base_i)):
+            return False
+
+    step_cb(3)
+    for path in [base_dst] + outputs:
+        rc = run_qemu(["check", "-f", "qcow2", path], log_q, prog_cb, eta_cb)
+        if rc != 0:
+            log_q.put(("error", f"qemu-img check falhou para {path} (código {rc})"))
+            return False
+    total_time = time.time() - t_start
+    stats["dst_bytes"] = os.path.getsize(base_dst) + sum(map(os.path.getsize, outputs))
+    stats["written"]   = stats["dst_bytes"]
+    if stats["naive_bytes"] and stats["dst_bytes"]:
+        stats["dedup_ratio"] = round(stats["naive_bytes"] / stats["dst_bytes"], 2)
+        log_q.put(("ok", f"Deduplicação: {human_bytes(stats['naive_bytes'])} → "
+                         f"{human_bytes(stats['dst_bytes'])}  "
+                         f"({stats['dedup_ratio']:.2f}×)"))
+    # Sem a frota, cada VM levaria aproximadamente o tempo da base.
+    stats["time_saved"] = round(max(0.0, base_time * n - total_time), 1)
+    log_q.put(("ok", f"Tempo economizado: ~{human_time(stats['time_saved'])}  "
+                     f"(total {human_time(total_time)})"))
+    prog_cb(100)
+    return True
 
-CONV_STEPS = ["Validar origem", "Converter", "Verificar saída"]
 
-class DiskForge(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("DiskForge")
-        self.configure(bg=C["bg"])
-        self.resizable(True, True)
-        self.minsize(860, 680)
-
-        self._src_var = tk.StringVar()
-        self._dst_var = tk.StringVar()
-        self._running = False
-        self._log_q   = queue.Queue()
-        self._steps_widget: StepList = None
-
-        self._src_var.trace_add("write", self._on_src_change)
-        self._build()
-        self._center()
-        self._check_deps_async()
-        self._poll()
-
-    def _center(self):
-        self.update_idletasks()
-        sw, sh = self.winfo_screenwidth(), self.winfo_screenheight()
-        w, h   = 980, 760
-        self.geometry(f"{w}x{h}+{max(0,(sw-w)//2)}+{max(0,(sh-h)//2)}")
-
-    # ─── Build ───────────────────────────────────────────────────────
-
-    def _build(self):
-        # ── Sidebar ──────────────────────────────────────────────────
-        sb = tk.Frame(self, bg=C["surface"], width=215)
-        sb.pack(side="left", fill="y"); sb.pack_propagate(False)
-
-        # Logo
-        lf = tk.Frame(sb, bg=C["surface"])
-        lf.pack(fill="x", padx=14, pady=(20,0))
-        tk.Label(lf, text="◈", font=("Segoe UI",22), fg=C["accent"],
-                 bg=C["surface"]).pack(side="left")
-        nf = tk.Frame(lf, bg=C["surface"]); nf.pack(side="left", padx=8)
-        tk.Label(nf, text="DiskForge", font=("Segoe UI",12,"bold"),
-                 fg=C["text"], bg=C["surface"]).pack(anchor="w")
-        tk.Label(nf, text="v1.1.0  •  Conversor Universal", font=("Segoe UI",7),
-                 fg=C["text3"], bg=C["surface"]).pack(anchor="w")
-
-        tk.Frame(sb, bg=C["border"], height=1).pack(fill="x", padx=12, pady=12)
-
-        # Status qemu
-        tk.Label(sb, text="FERRAMENTAS", font=("Segoe UI",7,"bold"),
-                 fg=C["text3"], bg=C["surface"]).pack(anchor="w", padx=14, pady=(0,5))
-        dep = tk.Frame(sb, bg=C["surface"]); dep.pack(fill="x", padx=14)
-        self._qemu_dot = tk.Label(dep, text="○", font=("Segoe UI",10),
-                                   fg=C["text3"], bg=C["surface"])
-        self._qemu_dot.pack(side="left")
-        tk.Label(dep, text="qemu-img", font=FF_SMALL,
-                 fg=C["text2"], bg=C["surface"]).pack(side="left", padx=6)
-
-        tk.Frame(sb, bg=C["border"], height=1).pack(fill="x", padx=12, pady=12)
-
-        # Lista de formatos
-        tk.Label(sb, text="FORMATOS SUPORTADOS", font=("Segoe UI",7,"bold"),
-                 fg=C["text3"], bg=C["surface"]).pack(anchor="w", padx=14, pady=(0,6))
-        for key, info in FORMATS.items():
-            row = tk.Frame(sb, bg=C["surface"]); row.pack(fill="x", padx=14, pady=1)
-            tk.Label(row, text=info["ext"], font=("Courier New",8),
-                     fg=C["accent"], bg=C["surface"], width=7, anchor="w").pack(side="left")
-            lbl = info["label"] + (" ★" if info["star"] else "")
-            tk.Label(row, text=lbl, font=("Segoe UI",8),
-                     fg=C["gold"] if info["star"] else C["text2"],
-                     bg=C["surface"]).pack(side="left")
-
-        # ── Main area ─────────────────────────────────────────────────
-        main = tk.Frame(self, bg=C["bg"])
-        main.pack(side="left", fill="both", expand=True)
-
-        # Bottom bar — empacotado antes do conteúdo para garantir visibilidade
-        bot = tk.Frame(main, bg=C["surface"])
-        bot.pack(fill="x", side="bottom")
-        bi = tk.Frame(bot, bg=C["surface"]); bi.pack(fill="x", padx=24, pady=10)
-        self._status_lbl = tk.Label(bi, text="Pronto.", font=FF_LABEL,
-                                    fg=C["text2"], bg=C["surface"])
-        self._status_lbl.pack(side="left")
-        self._go_btn = tk.Button(bi, text="▶  Iniciar Conversão",
-                                 font=("Segoe UI",10,"bold"),
-                                 bg=C["accent"], fg=C["text"], relief="flat",
-                                 bd=0, padx=18, pady=8, cursor="hand2",
-                                 activebackground="#3a6be0",
-                                 activeforeground=C["text"],
-                                 command=self._start_conversion)
-        self._go_btn.pack(side="right")
-
-        # Área de conteúdo scrollável
-        body = tk.Frame(main, bg=C["bg"])
-        body.pack(fill="both", expand=True)
-
-        # Header
-        hdr = tk.Frame(body, bg=C["bg"])
-        hdr.pack(fill="x", padx=24, pady=(18,0))
-        tk.Label(hdr, text="Conversor Universal de Discos", font=FF_TITLE,
-                 fg=C["text"], bg=C["bg"]).pack(anchor="w")
-        tk.Label(hdr, text="Converta entre qualquer combinação: RAW, QCOW2, VMDK, VDI, VHDX, VHD e mais.",
-                 font=FF_LABEL, fg=C["text2"], bg=C["bg"],
-                 wraplength=600, justify="left").pack(anchor="w", pady=(3,0))
-
-        tk.Frame(body, bg=C["border"], height=1).pack(fill="x", padx=24, pady=(12,10))
-
-        # ── Seletores de formato ──────────────────────────────────────
-        fmt_row = tk.Frame(body, bg=C["bg"])
-        fmt_row.pack(fill="x", padx=24, pady=(0,10))
-
-        self._fmt_in = FormatPicker(fmt_row, "FORMATO DE ENTRADA",
-                                    initial="vmdk", on_change=self._on_fmt_change)
-        self._fmt_in.pack(side="left", fill="x", expand=True)
-
-        arrow = tk.Frame(fmt_row, bg=C["bg"], width=46)
-        arrow.pack(side="left"); arrow.pack_propagate(False)
-        tk.Label(arrow, text="→", font=("Segoe UI",18),
-                 fg=C["accent"], bg=C["bg"]).place(relx=0.5, rely=0.5, anchor="center")
-
-        self._fmt_out = FormatPicker(fmt_row, "FORMATO DE SAÍDA",
-                                     initial="qcow2", on_change=self._on_fmt_change)
-        self._fmt_out.pack(side="left", fill="x", expand=True)
-
-        tk.Frame(body, bg=C["border"], height=1).pack(fill="x", padx=24, pady=(4,10))
-
-        # ── Arquivos + Etapas ─────────────────────────────────────────
-        files = tk.Frame(body, bg=C["bg"]); files.pack(fill="x", padx=24)
-
-        left = tk.Frame(files, bg=C["bg"]); left.pack(side="left", fill="x", expand=True)
-
-        right = tk.Frame(files, bg=C["bg"], width=175)
-        right.pack(side="right", fill="y", padx=(14,0)); right.pack_propagate(False)
-        tk.Label(right, text="ETAPAS", font=("Segoe UI",7,"bold"),
-                 fg=C["text3"], bg=C["bg"]).pack(anchor="w", pady=(2,5))
-        self._steps_widget = StepList(right, CONV_STEPS)
-        self._steps_widget.pack(anchor="w")
-
-        self._src_row = FileRow(left, "Arquivo de Origem",
-                                self._src_var, self._browse_src)
-        self._src_row.pack(fill="x", pady=(0,8))
-
-        self._dst_row = FileRow(left, "Arquivo de Destino",
-                                self._dst_var, self._browse_dst)
-        self._dst_row.pack(fill="x")
-
-        # ── Progresso ────────────────────────────────────────────────
-        prog = tk.Frame(body, bg=C["bg"]); prog.pack(fill="x", padx=24, pady=(12,0))
-
-        stats = tk.Frame(prog, bg=C["bg"]); stats.pack(fill="x", pady=(0,4))
-        self._pct_lbl = tk.Label(stats, text="", font=("Segoe UI",10,"bold"),
-                                  fg=C["accent"], bg=C["bg"]); self._pct_lbl.pack(side="left")
-        self._eta_lbl = tk.Label(stats, text="", font=FF_SMALL,
-                                  fg=C["text3"], bg=C["bg"]); self._eta_lbl.pack(side="right")
-        self._spd_lbl = tk.Label(stats, text="", font=FF_SMALL,
-                                  fg=C["text3"], bg=C["bg"]); self._spd_lbl.pack(side="right", padx=14)
-
-        self._progress = ProgressBar(prog, height=7)
-        self._progress.pack(fill="x")
-
-        # ── Log ──────────────────────────────────────────────────────
-        log_wrap = tk.Frame(body, bg=C["surface2"])
-        log_wrap.pack(fill="both", expand=True, padx=24, pady=(10,0))
-
-        lh = tk.Frame(log_wrap, bg=C["surface2"]); lh.pack(fill="x", padx=10, pady=(6,2))
-        tk.Label(lh, text="SAÍDA", font=("Segoe UI",7,"bold"),
-                 fg=C["text3"], bg=C["surface2"]).pack(side="left")
-        clr = tk.Label(lh, text="limpar", font=FF_SMALL, fg=C["text3"],
-                       bg=C["surface2"], cursor="hand2"); clr.pack(side="right")
-        clr.bind("<Button-1>", lambda _: self._log_txt.delete("1.0","end"))
-
-        self._log_txt = tk.Text(log_wrap, bg=C["surface2"], fg=C["text2"],
-                                font=FF_MONO, relief="flat", wrap="word",
-                                selectbackground=C["accent"],
-                                highlightthickness=0, bd=0, height=7)
-        sb2 = ttk.Scrollbar(log_wrap, command=self._log_txt.yview)
-        self._log_txt.configure(yscrollcommand=sb2.set)
-        sb2.pack(side="right", fill="y", pady=4, padx=(0,3))
-        self._log_txt.pack(side="left", fill="both", expand=True, padx=(10,0), pady=(0,6))
-
-        for tag, fg in [("info",C["text2"]),("ok",C["success"]),
-                        ("error",C["error"]),("warn",C["warning"]),("log",C["text3"])]:
-            self._log_txt.tag_config(tag, foreground=fg)
-
-    # ─── Eventos ─────────────────────────────────────────────────────
-
-    def _on_fmt_change(self, _=None): self._auto_dst()
-
-    def _on_src_change(self, *_):
-        p = self._src_var.get()
-        self._src_row.set_info(f"Tamanho: {human_size(p)}" if os.path.exists(p) else "")
-        self._auto_dst()
-
-    def _auto_dst(self):
-        src = self._src_var.get()
-        if not src: return
-        ext = FORMATS[self._fmt_out.get()]["ext"]
-        self._dst_var.set(str(Path(src).parent / f"{Path(src).stem}_converted{ext}"))
-
-    def _browse_src(self):
-        fmt = FORMATS[self._fmt_in.get()]
-        p = filedialog.askopenfilename(
-            title=f"Selecionar {fmt['label']}",
-            filetypes=[(f"{fmt['label']} (*{fmt['ext']})", f"*{fmt['ext']}"),
-                       ("Todos", "*.*")])
-        if p: self._src_var.set(p)
-
-    def _browse_dst(self):
-        fmt = FORMATS[self._fmt_out.get()]
-        p = filedialog.asksaveasfilename(
-            title="Salvar como",
-            defaultextension=fmt["ext"],
-            filetypes=[(f"{fmt['label']} (*{fmt['ext']})", f"*{fmt['ext']}")])
-        if p: self._dst_var.set(p)
-
-    # ─── Deps ────────────────────────────────────────────────────────
-
-    def _check_deps_async(self):
-        def _chk():
-            ok = bool(qemu_path())
-            self.after(0, lambda: self._qemu_dot.config(
-                text="●" if ok else "✕",
-                fg=C["success"] if ok else C["error"]))
-            if not ok:
-                self.after(0, lambda: messagebox.showwarning(
-                    "qemu-img não encontrado",
-                    f"Não foi possível encontrar tools/qemu/qemu-img.exe.\n\n"
-                    f"Certifique-se de que a pasta tools/qemu/ está junto ao script:\n"
-                    f"{SCRIPT_DIR}"))
-        threading.Thread(target=_chk, daemon=True).start()
-
-    # ─── Conversão ───────────────────────────────────────────────────
-
-    def _start_conversion(self):
-        if self._running: return
-        src, dst       = self._src_var.get().strip(), self._dst_var.get().strip()
-        fmt_in, fmt_out = self._fmt_in.get(), self._fmt_out.get()
-
-        if not qemu_path():
-            messagebox.showwarning("qemu-img não encontrado",
-                "Certifique-se de que a pasta tools/qemu/ está junto ao script.")
+# ─── Eventos (JSON lines) ────────────────────────────────────────────
+
+class EventStream:
+    """Eventos tipados em JSON lines para orquestradores.
+
+    Destinos: "-" (stdout), "unix:/caminho" (socket Unix local) ou um
+    caminho de arquivo, aberto em modo append. Com target=None nada é
+    emitido. Eventos: job_started, preflight, step, progress, warning,
+    error e job_finished; progress é limitado a um a cada `interval` s.
+    Em progress, bytes_est e rate são estimativas (pct × tamanho virtual),
+    não contagens de bytes copiados: o qemu-img só informa o percentual.
+    """
+
+    def __init__(self, target="-", job=None, interval=0.5):
+        self.job      = job or f"{os.getpid()}-{int(time.time() * 1000)}"
+        self.interval = interval
+        self.started  = time.time()
+        self._copy    = None             # (instante, pct) do início da cópia
+        self._lock    = threading.Lock()
+        self._last    = 0.0
+        self._out = self._sock = None
+        self._own = False
+        if target in ("-", "stdout"):
+            self._out = sys.stdout
+        elif target and target.startswith("unix:"):
+            if not hasattr(socket, "AF_UNIX"):
+                raise ValueError("Sockets Unix não são suportados nesta plataforma.")
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(target[5:])
+        elif target:
+            self._out, self._own = open(target, "a", encoding="utf-8"), True
+
+    @property
+    def enabled(self) -> bool:
+        return self._out is not None or self._sock is not None
+
+    def emit(self, event, **data):
+        if not self.enabled:
             return
-        if fmt_in == fmt_out:
-            messagebox.showwarning("Formatos iguais",
-                "O formato de entrada e saída são iguais. Escolha formatos diferentes.")
-            return
-        if not src or not dst:
-            messagebox.showwarning("Campos obrigatórios",
-                "Preencha os caminhos de origem e destino antes de iniciar.")
-            return
-        if not os.path.exists(src):
-            messagebox.showerror("Arquivo não encontrado",
-                f"O arquivo de origem não existe:\n{src}")
-            return
-
-        self._running = True
-        self._go_btn.config(state="disabled", text="Convertendo…")
-        self._status_lbl.config(text="Processando…", fg=C["warning"])
-        self._progress.set(0)
-        self._pct_lbl.config(text="0%")
-        self._eta_lbl.config(text=""); self._spd_lbl.config(text="")
-        self._steps_widget.reset()
-        self._log_txt.delete("1.0","end")
-        self._log_append("info",
-            f"Iniciando: {FORMATS[fmt_in]['label']} → {FORMATS[fmt_out]['label']}")
-
-        t0 = [time.time()]
-
-        def prog_cb(pct):
-            pct = max(0.0, min(100.0, pct))
-            self.after(0, lambda: self._progress.set(pct))
-            self.after(0, lambda: self._pct_lbl.config(text=f"{pct:.1f}%"))
-
-        def eta_cb(remain, pct):
-            elapsed = time.time() - t0[0]
-            if pct > 1: remain = max(0, elapsed/(pct/100) - elapsed)
-            self.after(0, lambda: self._eta_lbl.config(text=f"ETA: {human_time(remain)}"))
-            self.after(0, lambda: self._spd_lbl.config(text=f"Decorrido: {human_time(elapsed)}"))
-
-        def step_cb(idx):
-            self.after(0, lambda: self._steps_widget.activate(idx))
+        rec  = {"v": 1, "ts": round(time.time(), 3), "job": self.job, "event": event}
+        rec.update(data)
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                if self._sock:
+                    self._sock.sendall(line.encode("utf-8"))
+                else:
+                    self._out.write(line); self._out.flush()
+            except (OSError, ValueError):
+                # Consumidor saiu: a conversão continua sem eventos.
+                self._out = self._sock = None
 
-        def worker():
-            ok = conv_universal(src, dst, fmt_in, fmt_out,
-                                self._log_q, prog_cb, step_cb, eta_cb)
-            self._log_q.put(("__done__", ok))
+    def start_copy(self, pct=0.0):
+        """Marca o início da cópia; a taxa ignora o tempo de preflight."""
+        self._copy = (time.time(), pct)
 
-        threading.Thread(target=worker, daemon=True).start()
+    def copy_elapsed(self) -> float:
+        return time.time() - (self._copy[0] if self._copy else self.started)
 
-    # ─── Poll ────────────────────────────────────────────────────────
+    def progress(self, pct, total):
+        now = time.time()
+        if pct < 100 and now - self._last < self.interval:
+            return
+        self._last = now
+        done, rate = int(total * pct / 100), 0
+        if self._copy and now > self._copy[0]:
+            rate = int(total * (pct - self._copy[1]) / 100 / (now - self._copy[0]))
+        self.emit("progress", pct=round(pct, 2), bytes_est=done, total=total,
+                  rate=max(0, rate))
+
+    def close(self):
+        with self._lock:
+            if self._sock:
+                self._sock.close()
+            elif self._own:
+                self._out.close()
+            self._out = self._sock = None
+
+
+class _EventLog:
+    """Fila de log que também emite avisos e erros como eventos."""
+
+    KINDS = {"warn": "warning", "error": "error"}
+
+    def __init__(self, log_q, events):
+        self._q, self._events = log_q, events
+
+    def put(self, item):
+        kind, msg = item
+        if kind in self.KINDS:
+            self._events.emit(self.KINDS[kind], message=msg)
+        self._q.put(item)
+
+
+# ─── Linha de comando ────────────────────────────────────────────────
+
+class _StderrLog:
+    """Substitui a queue.Queue da GUI: log legível em stderr."""
+
+    def put(self, item):
+        kind, msg = item
+        print(f"{LOG_ICONS.get(kind, '·')} {msg}", file=sys.stderr, flush=True)
+
+
+def main_cli(argv) -> int:
+    ap = argparse.ArgumentParser(
+        prog="disk_converter",
+        description="DiskForge sem interface gráfica, para automação.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    cv = sub.add_parser("convert", help="converte uma imagem de disco")
+    cv.add_argument("src")
+    cv.add_argument("dst")
+    cv.add_argument("-f", "--from", dest="fmt_in",  required=True, choices=FORMATS)
+    cv.add_argument("-O", "--to",   dest="fmt_out", required=True, choices=FORMATS)
+    cv.add_argument("--no-prealloc", dest="prealloc", action="store_false",
+                    help="não pré-aloca a saída (para comparar o throughput)")
+
+    fl = sub.add_parser("fleet", help="converte VMs clonadas como overlays QCOW2 "
+                                      "sobre uma base compartilhada")
+    fl.add_argument("sources", nargs="+", metavar="src")
+    fl.add_argument("-f", "--from", dest="fmt_in", required=True, choices=FLEET_FORMATS)
+    fl.add_argument("-o", "--out-dir", dest="out_dir", required=True)
+    for p in (cv, fl):
+        p.add_argument("--events", default=None, metavar="DESTINO",
+                       help="eventos JSON lines: '-' (stdout), arquivo ou unix:/caminho")
+        p.add_argument("--job", default=None, help="identificador do job nos eventos")
+    args = ap.parse_args(argv)
 
-    def _poll(self):
-        try:
-            while True:
-                kind, msg = self._log_q.get_nowait()
-                if kind == "__done__":
-                    self._running = False
-                    self._go_btn.config(state="normal", text="▶  Iniciar Conversão")
-                    if msg:
-                        self._status_lbl.config(text="Concluído!", fg=C["success"])
-                        self._steps_widget.complete()
-                        messagebox.showinfo("Conversão concluída! ✓",
-                            f"Arquivo gerado com sucesso:\n\n{self._dst_var.get()}")
-                    else:
-                        self._status_lbl.config(text="Falha. Veja o log.", fg=C["error"])
-                else:
-                    self._log_append(kind, msg)
-        except queue.Empty:
-            pass
-        self.after(80, self._poll)
+    try:
+        events = EventStream(args.events, job=args.job)
+    except (OSError, ValueError) as e:
+        print(f"✗ Destino de eventos inválido: {e}", file=sys.stderr)
+        return 2
 
-    def _log_append(self, kind: str, msg: str):
-        ts = datetime.now().strftime("%H:%M:%S")
-        prefix = {"info":"ℹ","ok":"✓","error":"✗","warn":"⚠","log":"·"}.get(kind,"·")
-        self._log_txt.insert("end", f"[{ts}] {prefix} {msg}\n", kind)
-        self._log_txt.see("end")
+    noop = lambda *_: None
+    try:
+        if args.cmd == "fleet":
+            ok = conv_fleet(args.sources, args.out_dir, args.fmt_in,
+                            _StderrLog(), noop, noop, noop, events=events)
+        else:
+            ok = conv_universal(args.src, args.dst, args.fmt_in, args.fmt_out,
+                                _StderrLog(), noop, noop, noop, events=events,
+                                prealloc=args.prealloc)
+    finally:
+        events.close()
+    return 0 if ok else 1
 
 
 # ─── Entry ───────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main_cli(sys.argv[1:]))
+
     try:
         from ctypes import windll
         windll.shcore.SetProcessDpiAwareness(1)
     except: pass
 
+    # A GUI importa este módulo pelo nome; reaproveita o que já está rodando.
+    sys.modules.setdefault("disk_converter", sys.modules[__name__])
+    try:
+        from disk_converter_gui import DiskForge
+    except ImportError as e:
+        sys.exit(f"Interface gráfica indisponível ({e}): use a linha de comando "
+                 f"(disk_converter.py convert --help).")
+
     app = DiskForge()
     app.mainloop()